@@ -2,41 +2,42 @@
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.const import Platform
-from homeassistant.helpers import discovery
 
-from .const import DOMAIN
+from .const import DOMAIN, DATA_GATT_CACHE, SERVICE_CLEAR_GATT_CACHE
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR]
 
 
-async def async_setup(hass: HomeAssistant, config: dict) -> bool:
-    """Set up the NordicTrack Treadmill component."""
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    # Load sensor platform if domain is in config
-    if DOMAIN in config:
-        hass.async_create_task(
-            discovery.async_load_platform(
-                hass, Platform.SENSOR, DOMAIN, {}, config
-            )
-        )
+    if not hass.services.has_service(DOMAIN, SERVICE_CLEAR_GATT_CACHE):
 
-    _LOGGER.info("NordicTrack Treadmill integration loaded")
-    return True
+        async def async_clear_gatt_cache(call: ServiceCall) -> None:
+            """Forget cached characteristic handles so the next poll rediscovers them."""
+            hass.data[DOMAIN].get(DATA_GATT_CACHE, {}).clear()
+            _LOGGER.info("Cleared cached GATT handles")
 
-
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
+        hass.services.async_register(DOMAIN, SERVICE_CLEAR_GATT_CACHE, async_clear_gatt_cache)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _LOGGER.info("NordicTrack Treadmill integration loaded")
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if coordinator:
+            await coordinator.async_stop()
+        # Only the shared GATT cache left means this was the last entry
+        if hass.data[DOMAIN].keys() <= {DATA_GATT_CACHE}:
+            hass.services.async_remove(DOMAIN, SERVICE_CLEAR_GATT_CACHE)
+    return unload_ok
@@ -0,0 +1,71 @@
+"""Decoding of NordicTrack Treadmill BLE packets.
+
+Kept free of Home Assistant imports so it can be compiled (Cython/mypyc)
+without touching the sensor platform.
+"""
+import struct
+
+# Main telemetry frame: type, subtype, 2 reserved bytes, speed, incline
+_TELEMETRY = struct.Struct("<BBxxHH")
+
+# Sanity limits on the raw 0.1-unit values (20 mph, 15% incline)
+_SPEED_RAW_MAX = 200
+_INCLINE_RAW_MAX = 150
+
+# Raw value -> scaled value, so valid packets skip the float division
+_SPEED_VALUES = tuple(raw / 10.0 for raw in range(_SPEED_RAW_MAX + 1))
+_INCLINE_VALUES = tuple(raw / 10.0 for raw in range(_INCLINE_RAW_MAX + 1))
+
+
+def is_telemetry(data: bytes) -> bool:
+    """Return whether a frame is main telemetry, without decoding it."""
+    # Type: 00 12 - Main telemetry
+    return len(data) >= 10 and data[0] == 0x00 and data[1] == 0x12
+
+
+def unpack_telemetry(data: bytes) -> tuple[int, int, int, int]:
+    """Return the raw (type, subtype, speed, incline) fields of a telemetry frame.
+
+    Values are unscaled and unchecked, callers check is_telemetry() first.
+    """
+    return _TELEMETRY.unpack_from(data)
+
+
+class TreadmillPacket:
+    """A decoded main telemetry frame.
+
+    Fields that fail their sanity check are None.
+    """
+
+    __slots__ = ("speed", "incline", "status")
+
+    def __init__(self, speed: float | None, incline: float | None, status: str | None):
+        """Initialize the packet."""
+        self.speed = speed
+        self.incline = incline
+        self.status = status
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TreadmillPacket | None":
+        """Decode a packet, returning None if it is not main telemetry."""
+        if not is_telemetry(data):
+            return None
+        return cls.from_telemetry(data)
+
+    @classmethod
+    def from_telemetry(cls, data: bytes) -> "TreadmillPacket":
+        """Decode a frame the caller already checked with is_telemetry()."""
+        _, _, speed_raw, incline_raw = unpack_telemetry(data)
+
+        speed = incline = status = None
+
+        # Bytes 4-5: Speed (in 0.1 mph increments)
+        if speed_raw <= _SPEED_RAW_MAX:  # Sanity check
+            speed = _SPEED_VALUES[speed_raw]
+            status = "running" if speed_raw else "idle"
+
+        # Bytes 6-7: Incline (in 0.1% increments)
+        if incline_raw <= _INCLINE_RAW_MAX:  # Sanity check
+            incline = _INCLINE_VALUES[incline_raw]
+
+        return cls(speed, incline, status)
@@ -0,0 +1,61 @@
+"""Config flow for NordicTrack Treadmill integration."""
+import logging
+
+import voluptuous as vol
+
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+
+from .const import DOMAIN, CONF_MODE, MODE_PROXY, MODE_BLUETOOTH
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_MODE, default=MODE_PROXY): vol.In([MODE_PROXY, MODE_BLUETOOTH]),
+    }
+)
+
+
+class NordicTrackConfigFlow(ConfigFlow, domain=DOMAIN):
+    """Handle a config flow for NordicTrack Treadmill."""
+
+    VERSION = 1
+
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovery_info: BluetoothServiceInfoBleak | None = None
+
+    async def async_step_bluetooth(
+        self, discovery_info: BluetoothServiceInfoBleak
+    ) -> ConfigFlowResult:
+        """Handle the treadmill being discovered over Bluetooth."""
+        _LOGGER.debug("Discovered treadmill %s (%s)", discovery_info.name, discovery_info.address)
+        await self.async_set_unique_id(DOMAIN)
+        self._abort_if_unique_id_configured()
+        self._discovery_info = discovery_info
+        self.context["title_placeholders"] = {"name": discovery_info.name}
+        return await self.async_step_bluetooth_confirm()
+
+    async def async_step_bluetooth_confirm(
+        self, user_input: dict | None = None
+    ) -> ConfigFlowResult:
+        """Confirm adding the discovered treadmill."""
+        if user_input is not None:
+            return self.async_create_entry(title="NordicTrack Treadmill", data=user_input)
+
+        return self.async_show_form(
+            step_id="bluetooth_confirm",
+            data_schema=DATA_SCHEMA,
+            description_placeholders={"name": self._discovery_info.name},
+        )
+
+    async def async_step_user(self, user_input: dict | None = None) -> ConfigFlowResult:
+        """Handle the initial step."""
+        await self.async_set_unique_id(DOMAIN)
+        self._abort_if_unique_id_configured()
+
+        if user_input is not None:
+            return self.async_create_entry(title="NordicTrack Treadmill", data=user_input)
+
+        return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA)
@@ -11,6 +11,17 @@ SERVICE_UUID = "00001533-1412-efde-1523-785feabcd123"
 NOTIFY_CHAR_UUID = "00001535-1412-efde-1523-785feabcd123"
 WRITE_CHAR_UUID = "00001534-1412-efde-1523-785feabcd123"
 
+# Connection modes
+CONF_MODE = "mode"
+MODE_PROXY = "proxy"  # Direct ESPHome API connection to the BLE proxy
+MODE_BLUETOOTH = "bluetooth"  # Home Assistant bluetooth stack via Bleak
+
+# hass.data keys
+DATA_GATT_CACHE = "gatt_cache"
+
+# Services
+SERVICE_CLEAR_GATT_CACHE = "clear_gatt_cache"
+
 # Sensor types
 SENSOR_SPEED = "speed"
 SENSOR_INCLINE = "incline"
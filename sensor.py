@@ -1,12 +1,20 @@
-"""NordicTrack Treadmill sensor platform - Direct ESPHome Proxy (WORKING)."""
+"""NordicTrack Treadmill sensor platform."""
 import logging
 import asyncio
 from datetime import timedelta
-
-from aioesphomeapi import APIClient, APIConnectionError
+from time import monotonic
+
+from aioesphomeapi import APIClient, APIConnectionError, BluetoothProxyFeature
+from aioesphomeapi.core import (
+    BluetoothConnectionDroppedError,
+    BluetoothConnectionParamsAPIError,
+    BluetoothGATTAPIError,
+    TimeoutAPIError,
+)
+from bleak import BleakClient
+from homeassistant.components import bluetooth
 from homeassistant.components.sensor import (
     SensorEntity,
-    SensorDeviceClass,
     SensorStateClass,
 )
 from homeassistant.const import (
@@ -15,16 +23,21 @@ from homeassistant.const import (
     UnitOfTime,
     PERCENTAGE,
 )
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.helpers.event import async_track_time_interval
 
+from .codec import TreadmillPacket, is_telemetry
 from .const import (
     DOMAIN,
     TREADMILL_NAME,
-    SERVICE_UUID,
-    NOTIFY_CHAR_UUID,
+    TREADMILL_MAC,
+    CONF_MODE,
+    DATA_GATT_CACHE,
+    MODE_PROXY,
+    MODE_BLUETOOTH,
     SENSOR_SPEED,
     SENSOR_INCLINE,
     SENSOR_DISTANCE,
@@ -42,279 +55,823 @@ PROXY_PASSWORD = ""
 PROXY_ENCRYPTION_KEY = "EX1k2GYkbgzMjskMOTy9I4DG7c+lM3bAWs5T2guUvvQ="
 
 # BLE Characteristic UUID
-CHAR_NOTIFY_1_UUID = "00001535-1412-efde-1523-785feabcd123"
+CHAR_NOTIFY_1_UUID = "00001535-1412-efde-1523-785feabcd123"  # Main data (73 bytes)
+_NOTIFY_UUID_LOWER = CHAR_NOTIFY_1_UUID.lower()
+
+# Client Characteristic Configuration descriptor and its notify on/off values
+CCCD_UUID = "00002902-0000-1000-8000-00805f9b34fb"
+CCCD_ENABLE_NOTIFY = b"\x01\x00"
+CCCD_DISABLE_NOTIFY = b"\x00\x00"
+
+# ESP-IDF GATT status returned when a read targets a stale handle
+GATT_INVALID_HANDLE = 0x01
+
+# BLE connect timeout, shared by the proxy and our own wait so the proxy
+# frees its connection slot as soon as we give up
+CONNECT_TIMEOUT = 15.0
+
+# Connection parameters requested once connected
+CONN_MIN_INTERVAL = 800  # 1.25 ms units (1 s)
+CONN_MAX_INTERVAL = 1000  # 1.25 ms units (1.25 s)
+CONN_SUPERVISION_TIMEOUT = 3000  # 10 ms units (30 s)
 
 # Polling interval
 POLL_INTERVAL = timedelta(seconds=30)
 
+# Longest wait between reconnect attempts to an unreachable treadmill
+IDLE_POLL_INTERVAL = timedelta(minutes=5)
+
+# Silence on a notification subscription before the link is checked
+WATCHDOG_INTERVAL = timedelta(minutes=5)
+
+# Sensor type -> (name, unique id, icon, unit)
+SENSOR_SPECS = {
+    SENSOR_SPEED: ("NordicTrack Speed", "nordictrack_treadmill_speed", "mdi:speedometer", UnitOfSpeed.MILES_PER_HOUR),
+    SENSOR_INCLINE: ("NordicTrack Incline", "nordictrack_treadmill_incline", "mdi:angle-acute", PERCENTAGE),
+    SENSOR_DISTANCE: ("NordicTrack Distance", "nordictrack_treadmill_distance", "mdi:map-marker-distance", UnitOfLength.MILES),
+    SENSOR_TIME: ("NordicTrack Time", "nordictrack_treadmill_time", "mdi:timer-outline", UnitOfTime.SECONDS),
+    SENSOR_CALORIES: ("NordicTrack Calories", "nordictrack_treadmill_calories", "mdi:fire", "cal"),
+    SENSOR_STATUS: ("NordicTrack Status", "nordictrack_treadmill_status", "mdi:run", None),
+}
+
+# Device info shared by every sensor entity
+DEVICE_INFO = DeviceInfo(
+    identifiers={(DOMAIN, "nordictrack_t5")},
+    name="NordicTrack T5 Treadmill",
+    manufacturer="NordicTrack",
+    model="T5",
+)
+
 
-async def async_setup_platform(
+async def async_setup_entry(
     hass: HomeAssistant,
-    config: ConfigType,
+    entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
-    discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
     """Set up the NordicTrack Treadmill sensors."""
+    mode = entry.data.get(CONF_MODE, MODE_PROXY)
+    coordinator_cls = COORDINATORS.get(mode)
+    if coordinator_cls is None:
+        _LOGGER.error("Unknown connection mode: %s", mode)
+        return
 
     # Create sensor entities
-    sensors = [
-        NordicTrackSensor(hass, SENSOR_SPEED, "Speed", "mdi:speedometer", UnitOfSpeed.MILES_PER_HOUR),
-        NordicTrackSensor(hass, SENSOR_INCLINE, "Incline", "mdi:angle-acute", PERCENTAGE),
-        NordicTrackSensor(hass, SENSOR_DISTANCE, "Distance", "mdi:map-marker-distance", UnitOfLength.MILES),
-        NordicTrackSensor(hass, SENSOR_TIME, "Time", "mdi:timer-outline", UnitOfTime.SECONDS),
-        NordicTrackSensor(hass, SENSOR_CALORIES, "Calories", "mdi:fire", "cal"),
-        NordicTrackSensor(hass, SENSOR_STATUS, "Status", "mdi:run", None),
-    ]
+    sensors = [NordicTrackSensor(hass, sensor_type) for sensor_type in SENSOR_SPECS]
 
     async_add_entities(sensors, True)
 
-    # Set up active poller via ESPHome proxy
-    coordinator = TreadmillESPProxyCoordinator(hass, sensors)
+    coordinator = coordinator_cls(hass, sensors)
+    hass.data[DOMAIN][entry.entry_id] = coordinator
     await coordinator.async_start()
 
-    _LOGGER.info("NordicTrack Treadmill initialized (ESP proxy direct connection)")
+    _LOGGER.info("NordicTrack Treadmill initialized (%s mode)", mode)
 
 
-class TreadmillESPProxyCoordinator:
-    """Coordinator to poll treadmill directly via ESPHome BLE proxy."""
+class TreadmillCoordinator:
+    """Base coordinator shared by every treadmill transport."""
+
+    __slots__ = (
+        "hass",
+        "sensors",
+        "_speed",
+        "_incline",
+        "_status",
+        "_cancel_callback",
+        "_last_data",
+        "_available",
+    )
 
     def __init__(self, hass: HomeAssistant, sensors: list):
         """Initialize the coordinator."""
         self.hass = hass
-        self.sensors = {sensor.sensor_type: sensor for sensor in sensors}
+        self.sensors = sensors
+        by_type = {sensor.sensor_type: sensor for sensor in sensors}
+        self._speed = by_type[SENSOR_SPEED]
+        self._incline = by_type[SENSOR_INCLINE]
+        self._status = by_type[SENSOR_STATUS]
         self._cancel_callback = None
-        self._previous_values = {}
+        self._last_data = None
+        self._available = None
+
+    async def async_stop(self):
+        """Stop receiving treadmill data."""
+        if self._cancel_callback:
+            self._cancel_callback()
+            self._cancel_callback = None
+
+    def _parse_and_update(self, data: bytes | bytearray):
+        """Parse treadmill data and update sensors."""
+
+        # Keepalives and button events carry nothing for the sensors
+        if not is_telemetry(data):
+            # Slicing copes with frames too short to carry a message type
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("Message type: %s (not telemetry - treadmill idle?)",
+                             data[:2].hex(" "))
+            return
+
+        # An identical frame cannot change any sensor
+        if data == self._last_data:
+            return
+        # Only changed frames are copied, the buffer itself may be reused
+        self._last_data = bytes(data)
+
+        # Only pay for hex-encoding the packet when debug logging is on
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("Data: %s", data.hex())
+
+        # Checked as telemetry above, skip from_bytes() checking it again
+        packet = TreadmillPacket.from_telemetry(data)
+
+        speed = packet.speed
+        incline = packet.incline
+        status = packet.status
+
+        # The level cannot change while a single frame is handled
+        log_info = _LOGGER.isEnabledFor(logging.INFO)
+        changed = []
+
+        if speed is not None and speed != self._speed.native_value:
+            if log_info:
+                _LOGGER.info("Speed: %.1f mph", speed)
+            self._speed.update_value(speed, write=False)
+            changed.append(self._speed)
+
+        if incline is not None and incline != self._incline.native_value:
+            if log_info:
+                _LOGGER.info("Incline: %.1f%%", incline)
+            self._incline.update_value(incline, write=False)
+            changed.append(self._incline)
+
+        if status is not None and status != self._status.native_value:
+            if log_info:
+                _LOGGER.info("Status: %s", status)
+            self._status.update_value(status, write=False)
+            changed.append(self._status)
+
+        # Write once the whole frame is applied, so listeners of one
+        # sensor never see the others still holding the previous frame
+        for sensor in changed:
+            sensor.async_write_ha_state()
+
+    def _update_sensor_availability(self, available: bool):
+        """Update availability of all sensors."""
+        # Every poll reports availability, usually without a change
+        if available == self._available:
+            return
+        self._available = available
+        for sensor in self.sensors:
+            sensor.set_available(available)
+
+
+class TreadmillESPProxyCoordinator(TreadmillCoordinator):
+    """Coordinator to poll treadmill directly via ESPHome BLE proxy."""
+
+    __slots__ = (
+        "_esp_client",
+        "_tcp_ok",
+        "_treadmill_address",
+        "_treadmill_address_type",
+        "_gatt_cache",
+        "_disconnect_callback",
+        "_is_connected",
+        "_found",
+        "_notify_handle",
+        "_cccd_handle",
+        "_remove_notify_callback",
+        "_last_seen",
+        "_timer",
+        "_current_interval",
+        "_running",
+        "_adv_unsub",
+        "_feature_flags",
+    )
+
+    def __init__(self, hass: HomeAssistant, sensors: list):
+        """Initialize the coordinator."""
+        super().__init__(hass, sensors)
         self._esp_client = None
+        self._tcp_ok = False
         self._treadmill_address = None
-        self._char_handle = None
+        self._treadmill_address_type = None
+        # (characteristic, CCCD) handles by treadmill address, kept across reconnects
+        self._gatt_cache = hass.data[DOMAIN].setdefault(DATA_GATT_CACHE, {})
         self._disconnect_callback = None
         self._is_connected = False
+        self._found = asyncio.Event()
+        self._notify_handle = None
+        self._cccd_handle = None
+        self._remove_notify_callback = None
+        self._last_seen = 0.0
+        self._timer = None
+        self._current_interval = POLL_INTERVAL.total_seconds()
+        self._running = False
+        self._adv_unsub = None
+        self._feature_flags = 0
 
     async def async_start(self):
-        """Start active polling via ESP proxy."""
-        _LOGGER.info("Connecting to ESP proxy at %s:%s", PROXY_HOST, PROXY_PORT)
+        """Start receiving treadmill notifications via ESP proxy."""
+        try:
+            await self._async_ensure_tcp()
+
+            # Wait for treadmill discovery, returning as soon as it advertises
+            _LOGGER.info("Scanning for treadmill...")
+            try:
+                await asyncio.wait_for(self._found.wait(), timeout=10.0)
+            except asyncio.TimeoutError:
+                _LOGGER.warning("Treadmill not found, will retry on next poll")
+                self._update_sensor_availability(False)
+
+        except Exception as e:
+            _LOGGER.error("Failed to connect to ESP proxy: %s", e)
+            self._update_sensor_availability(False)
 
-        # Connect to ESP proxy
-        self._esp_client = APIClient(
+        # Subscribe immediately, then periodically make sure the
+        # subscription (and the proxy session) is still alive
+        self._running = True
+        await self._async_scheduled_poll()
+
+    async def _async_ensure_tcp(self):
+        """Connect to the ESP proxy unless the current API session is still up.
+
+        Only a lost API session needs a new APIClient and noise handshake;
+        BLE errors towards the treadmill leave the session in place.
+        """
+        if self._esp_client and self._tcp_ok:
+            return
+
+        if self._esp_client:
+            try:
+                await self._esp_client.disconnect(force=True)
+            except Exception as e:
+                _LOGGER.debug("Error closing stale ESP proxy session: %s", e)
+            self._esp_client = None
+            self._disconnect_callback = None
+
+        _LOGGER.info("Connecting to ESP proxy at %s:%s", PROXY_HOST, PROXY_PORT)
+        client = APIClient(
             PROXY_HOST,
             PROXY_PORT,
             PROXY_PASSWORD,
             noise_psk=PROXY_ENCRYPTION_KEY
         )
+        await client.connect(on_stop=self._async_on_proxy_stop, login=True)
+        self._esp_client = client
+        self._tcp_ok = True
 
-        try:
-            await self._esp_client.connect(login=True)
-            device_info = await self._esp_client.device_info()
-            _LOGGER.info("Connected to ESP proxy: %s (ESPHome %s)",
-                        device_info.name, device_info.esphome_version)
-
+        # Start scanning before asking for device info, so discovery
+        # overlaps that round trip instead of waiting behind it
+        if not self._treadmill_address:
             # Subscribe to BLE advertisements to find treadmill
             def on_advertisement(data):
-                if data.name == TREADMILL_NAME and not self._treadmill_address:
-                    self._treadmill_address = data.address
-                    _LOGGER.info("Found treadmill at address: %s", self._treadmill_address)
+                if self._treadmill_address or data.name != TREADMILL_NAME:
+                    return
+                self._treadmill_address = data.address
+                self._treadmill_address_type = data.address_type
+                _LOGGER.info("Found treadmill at address: %s", self._treadmill_address)
+                self._found.set()
+                # The proxy streams every advertisement it hears, stop once found
+                self.hass.loop.call_soon(self._stop_scanning)
 
             # This returns a callback (unsub function), don't await it
-            self._esp_client.subscribe_bluetooth_le_advertisements(on_advertisement)
+            self._adv_unsub = client.subscribe_bluetooth_le_advertisements(on_advertisement)
 
-            # Wait for treadmill discovery
-            _LOGGER.info("Scanning for treadmill...")
-            await asyncio.sleep(10)
+        device_info = await client.device_info()
+        self._feature_flags = device_info.bluetooth_proxy_feature_flags_compat(
+            client.api_version
+        )
+        _LOGGER.info("Connected to ESP proxy: %s (ESPHome %s)",
+                    device_info.name, device_info.esphome_version)
 
-            if not self._treadmill_address:
-                _LOGGER.warning("Treadmill not found, will retry on next poll")
-                self._update_sensor_availability(False)
+    async def _async_on_proxy_stop(self, expected_disconnect: bool):
+        """Handle the API session to the ESP proxy going away."""
+        self._tcp_ok = False
+        self._is_connected = False
+        self._adv_unsub = None
+        self._clear_notify()
+        if not expected_disconnect:
+            _LOGGER.warning("Lost connection to ESP proxy")
+            self._update_sensor_availability(False)
 
-            # Start polling
-            self._cancel_callback = async_track_time_interval(
-                self.hass,
-                self._async_poll_treadmill,
-                POLL_INTERVAL,
+    @callback
+    def _stop_scanning(self):
+        """Unsubscribe from the proxy's BLE advertisements."""
+        if self._adv_unsub:
+            self._adv_unsub()
+            self._adv_unsub = None
+
+    @callback
+    def _schedule(self):
+        """Arm the timer for the next subscription check."""
+        self._timer = self.hass.loop.call_later(
+            self._current_interval, self._on_timer
+        )
+
+    @callback
+    def _on_timer(self):
+        """Run a subscription check from the timer."""
+        self._timer = None
+        self.hass.async_create_task(self._async_scheduled_poll())
+
+    async def _async_scheduled_poll(self):
+        """Run a subscription check and re-arm the timer.
+
+        Reconnect attempts to a treadmill that is switched off fail every
+        time, so retries back off exponentially up to IDLE_POLL_INTERVAL
+        and snap back to POLL_INTERVAL once the subscription is up.
+        """
+        await self._async_poll_treadmill(None)
+
+        if self._notify_handle is not None or not self._treadmill_address:
+            self._current_interval = POLL_INTERVAL.total_seconds()
+        else:
+            self._current_interval = min(
+                self._current_interval * 2, IDLE_POLL_INTERVAL.total_seconds()
             )
+            _LOGGER.debug("Treadmill unreachable, next attempt in %d s",
+                         self._current_interval)
+
+        if self._running:
+            self._schedule()
 
-            # Do first poll immediately
-            await self._async_poll_treadmill(None)
+    async def _async_poll_treadmill(self, now):
+        """Ensure the treadmill notification subscription is up via ESP proxy.
+
+        While subscribed the treadmill pushes its data, so this only touches
+        the BLE link to reconnect or after WATCHDOG_INTERVAL of silence.
+        """
+        if (
+            self._tcp_ok
+            and self._notify_handle is not None
+            and monotonic() - self._last_seen < WATCHDOG_INTERVAL.total_seconds()
+        ):
+            return
 
+        try:
+            await self._async_ensure_tcp()
         except Exception as e:
-            _LOGGER.error("Failed to connect to ESP proxy: %s", e)
+            _LOGGER.warning("ESP proxy not reachable: %s", e)
             self._update_sensor_availability(False)
+            return
 
-    async def _async_poll_treadmill(self, now):
-        """Poll treadmill for current data via ESP proxy."""
-        if not self._esp_client or not self._treadmill_address:
-            _LOGGER.debug("ESP client or treadmill address not ready")
+        if not self._treadmill_address:
+            _LOGGER.debug("Treadmill address not known yet")
             return
 
+        # Handles from an earlier connection let the proxy skip service discovery
+        handles = self._gatt_cache.get(self._treadmill_address)
+
         try:
             # Connect to treadmill if not connected
             if not self._is_connected:
                 _LOGGER.debug("Connecting to treadmill...")
                 connected = asyncio.Event()
 
+                # Drop the state handler of the previous connection attempt
+                if self._disconnect_callback:
+                    self._disconnect_callback()
+                    self._disconnect_callback = None
+
                 def on_connection_state(is_connected, mtu, error):
                     self._is_connected = is_connected
                     if is_connected:
                         _LOGGER.debug("Connected (MTU: %d)", mtu)
                         connected.set()
-                    elif error:
+                        return
+                    if error:
                         _LOGGER.warning("Connection error: %d", error)
+                    self._clear_notify()
+                    self._update_sensor_availability(False)
 
                 self._disconnect_callback = await self._esp_client.bluetooth_device_connect(
                     self._treadmill_address,
                     on_connection_state,
-                    timeout=30.0
+                    timeout=CONNECT_TIMEOUT,
+                    feature_flags=self._feature_flags,
+                    has_cache=(
+                        handles is not None
+                        and bool(self._feature_flags & BluetoothProxyFeature.REMOTE_CACHING)
+                    ),
+                    address_type=self._treadmill_address_type,
                 )
 
                 try:
-                    await asyncio.wait_for(connected.wait(), timeout=15.0)
+                    await asyncio.wait_for(connected.wait(), timeout=CONNECT_TIMEOUT)
                 except asyncio.TimeoutError:
                     _LOGGER.warning("Connection timeout")
                     self._update_sensor_availability(False)
                     return
 
-                # Discover services to get characteristic handle
-                if not self._char_handle:
-                    _LOGGER.debug("Discovering GATT services...")
-                    services = await self._esp_client.bluetooth_gatt_get_services(
-                        self._treadmill_address
+                await self._async_set_slow_connection_params()
+
+            # Discover services only if no handles are cached for this treadmill
+            if handles is None:
+                _LOGGER.debug("Discovering GATT services...")
+                services = await self._esp_client.bluetooth_gatt_get_services(
+                    self._treadmill_address
+                )
+
+                # aioesphomeapi reports UUIDs as lower-case strings
+                char = next(
+                    (
+                        char
+                        for service in services.services
+                        for char in service.characteristics
+                        if char.uuid == _NOTIFY_UUID_LOWER
+                    ),
+                    None,
+                )
+                cccd_handle = None
+                if char is not None:
+                    cccd_handle = next(
+                        (desc.handle for desc in char.descriptors if desc.uuid == CCCD_UUID),
+                        None,
                     )
 
-                    for service in services.services:
-                        for char in service.characteristics:
-                            if char.uuid.lower() == CHAR_NOTIFY_1_UUID.lower():
-                                self._char_handle = char.handle
-                                _LOGGER.info("Found target characteristic (handle: %d)", self._char_handle)
-                                break
+                if cccd_handle is None:
+                    _LOGGER.error("Target characteristic or its CCCD not found")
+                    self._update_sensor_availability(False)
+                    return
+                _LOGGER.info("Found target characteristic (handle: %d, CCCD: %d)",
+                            char.handle, cccd_handle)
 
-                    if not self._char_handle:
-                        _LOGGER.error("Target characteristic not found")
-                        self._update_sensor_availability(False)
-                        return
+                handles = (char.handle, cccd_handle)
+                self._gatt_cache[self._treadmill_address] = handles
+            char_handle, cccd_handle = handles
 
-            # Read characteristic
+            # Subscribe to notifications
+            if self._notify_handle is None:
+                _LOGGER.debug("Subscribing to notifications...")
+                _, self._remove_notify_callback = await self._esp_client.bluetooth_gatt_start_notify(
+                    self._treadmill_address,
+                    char_handle,
+                    self._on_notify,
+                )
+                self._notify_handle = char_handle
+                # The proxy leaves descriptors to the client on v3 connections,
+                # so the treadmill only pushes once we enable it in the CCCD
+                await self._esp_client.bluetooth_gatt_write_descriptor(
+                    self._treadmill_address, cccd_handle, CCCD_ENABLE_NOTIFY
+                )
+                self._cccd_handle = cccd_handle
+                _LOGGER.info("Subscribed to treadmill notifications")
+
+            # Read characteristic to get the current state and prove the link is alive
             _LOGGER.debug("Reading characteristic...")
             data = await self._esp_client.bluetooth_gatt_read(
                 self._treadmill_address,
-                self._char_handle,
+                char_handle,
                 timeout=10.0
             )
 
             _LOGGER.debug("Read %d bytes", len(data))
+            self._last_seen = monotonic()
             self._parse_and_update(data)
             self._update_sensor_availability(True)
 
+        except BluetoothGATTAPIError as e:
+            if e.error.error == GATT_INVALID_HANDLE:
+                _LOGGER.warning("Cached characteristic handle is invalid, rediscovering on next poll")
+                self._gatt_cache.pop(self._treadmill_address, None)
+                # A cached connection has no service list on the proxy, reconnect without it
+                await self._async_disconnect_treadmill()
+            else:
+                _LOGGER.error("Error reading treadmill: %s", e)
+            self._clear_notify()
+            self._update_sensor_availability(False)
+
+        except (TimeoutAPIError, BluetoothConnectionDroppedError) as e:
+            # Subclasses of APIConnectionError raised for the BLE link, such as
+            # an unreachable treadmill; the API session to the proxy stays up
+            _LOGGER.warning("Treadmill connection failed: %s", e)
+            self._is_connected = False
+            self._clear_notify()
+            self._update_sensor_availability(False)
+
+        except APIConnectionError as e:
+            _LOGGER.warning("ESP proxy connection error: %s", e)
+            self._tcp_ok = False
+            self._is_connected = False
+            self._clear_notify()
+            self._update_sensor_availability(False)
+
         except Exception as e:
+            # BLE-level failure, the API session to the proxy stays up
             _LOGGER.error("Error polling treadmill: %s", e, exc_info=True)
             self._is_connected = False
-            self._char_handle = None
+            self._clear_notify()
             self._update_sensor_availability(False)
 
-    def _parse_and_update(self, data: bytes):
-        """Parse treadmill data and update sensors."""
-
-        if len(data) < 2:
+    async def _async_set_slow_connection_params(self):
+        """Ask the proxy for a slow connection interval to save radio wakeups."""
+        if not self._feature_flags & BluetoothProxyFeature.CONNECTION_PARAMS_SETTING:
+            # Firmware that predates the request would only time out on it
             return
+        try:
+            await self._esp_client.bluetooth_device_set_connection_params(
+                self._treadmill_address,
+                min_interval=CONN_MIN_INTERVAL,
+                max_interval=CONN_MAX_INTERVAL,
+                latency=0,
+                timeout=CONN_SUPERVISION_TIMEOUT,
+            )
+        except BluetoothConnectionParamsAPIError as e:
+            # The treadmill refused the update, keep its own interval
+            _LOGGER.debug("Proxy rejected connection parameters: %s", e)
 
-        hex_data = data.hex()
-        _LOGGER.debug("Data: %s", hex_data)
-
-        msg_type = data[0]
-        msg_subtype = data[1] if len(data) > 1 else 0
-
-        # Type: 00 12 - Main telemetry
-        if msg_type == 0x00 and msg_subtype == 0x12 and len(data) >= 10:
-            # Bytes 4-5: Speed (in 0.1 mph increments)
-            if len(data) >= 6:
-                speed_raw = (data[5] << 8) | data[4]
-                speed = speed_raw / 10.0
-                if 0 <= speed <= 20:  # Sanity check
-                    if self._previous_values.get(SENSOR_SPEED) != speed:
-                        _LOGGER.info("Speed: %.1f mph", speed)
-                    self._previous_values[SENSOR_SPEED] = speed
-                    self.sensors[SENSOR_SPEED].update_value(speed)
-
-            # Bytes 6-7: Incline (in 0.5% increments)
-            if len(data) >= 8:
-                incline_raw = (data[7] << 8) | data[6]
-                incline = incline_raw / 10.0
-                if 0 <= incline <= 15:  # Sanity check
-                    if self._previous_values.get(SENSOR_INCLINE) != incline:
-                        _LOGGER.info("Incline: %.1f%%", incline)
-                    self._previous_values[SENSOR_INCLINE] = incline
-                    self.sensors[SENSOR_INCLINE].update_value(incline)
-
-            # Update status
-            status = "running" if speed > 0 else "idle"
-            if self._previous_values.get(SENSOR_STATUS) != status:
-                _LOGGER.info("Status: %s", status)
-            self._previous_values[SENSOR_STATUS] = status
-            self.sensors[SENSOR_STATUS].update_value(status)
-        else:
-            _LOGGER.debug("Message type: 0x%02x %02x (not telemetry - treadmill idle?)",
-                         msg_type, msg_subtype)
+    async def _async_disconnect_treadmill(self):
+        """Drop the BLE connection to the treadmill, keeping the proxy session."""
+        self._is_connected = False
+        try:
+            await self._esp_client.bluetooth_device_disconnect(self._treadmill_address)
+        except Exception as e:
+            _LOGGER.debug("Error disconnecting treadmill: %s", e)
 
-    def _update_sensor_availability(self, available: bool):
-        """Update availability of all sensors."""
-        for sensor in self.sensors.values():
-            sensor.set_available(available)
+    @callback
+    def _on_notify(self, handle: int, data: bytearray):
+        """Handle a notification pushed by the treadmill."""
+        self._last_seen = monotonic()
+        self._parse_and_update(data)
+
+    @callback
+    def _clear_notify(self):
+        """Forget the current notification subscription."""
+        if self._remove_notify_callback:
+            self._remove_notify_callback()
+            self._remove_notify_callback = None
+        self._notify_handle = None
+        self._cccd_handle = None
 
     async def async_stop(self):
-        """Stop polling and disconnect."""
-        if self._cancel_callback:
-            self._cancel_callback()
+        """Stop notifications and disconnect."""
+        await super().async_stop()
+        self._running = False
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._stop_scanning()
+        if self._is_connected and self._notify_handle is not None:
+            try:
+                if self._cccd_handle is not None:
+                    await self._esp_client.bluetooth_gatt_write_descriptor(
+                        self._treadmill_address, self._cccd_handle, CCCD_DISABLE_NOTIFY
+                    )
+                # Synchronous, it only drops the proxy-side notify callback
+                self._esp_client.bluetooth_gatt_stop_notify(
+                    self._treadmill_address, self._notify_handle
+                )
+            except Exception as e:
+                _LOGGER.debug("Error stopping notifications: %s", e)
+        self._clear_notify()
         if self._is_connected and self._disconnect_callback:
             try:
                 await self._esp_client.bluetooth_device_disconnect(self._treadmill_address)
-                self._disconnect_callback()
-            except:
-                pass
+            except Exception as e:
+                _LOGGER.debug("Error disconnecting treadmill: %s", e)
+        if self._disconnect_callback:
+            self._disconnect_callback()
+            self._disconnect_callback = None
         if self._esp_client:
             await self._esp_client.disconnect()
-        _LOGGER.info("Stopped ESP proxy polling")
+        _LOGGER.info("Stopped ESP proxy connection")
+
+
+class TreadmillBLECoordinator(TreadmillCoordinator):
+    """Coordinator to receive treadmill notifications via HA bluetooth/proxy."""
+
+    __slots__ = (
+        "_client",
+        "_char",
+        "_notifying",
+        "_last_seen",
+        "_lock",
+        "_adv_unsub",
+        "_retry_after",
+        "_retry_interval",
+    )
+
+    def __init__(self, hass: HomeAssistant, sensors: list):
+        """Initialize the coordinator."""
+        super().__init__(hass, sensors)
+        self._client = None
+        self._char = None
+        self._notifying = False
+        self._last_seen = 0.0
+        self._lock = asyncio.Lock()
+        self._adv_unsub = None
+        # Adverts before this monotonic time don't trigger a reconnect
+        self._retry_after = 0.0
+        self._retry_interval = POLL_INTERVAL.total_seconds()
+
+    async def async_start(self):
+        """Start receiving treadmill notifications."""
+        _LOGGER.info("Starting BLE notifications")
+
+        # Reconnect as soon as the treadmill advertises again
+        self._adv_unsub = bluetooth.async_register_callback(
+            self.hass,
+            self._on_advertisement,
+            bluetooth.BluetoothCallbackMatcher(address=TREADMILL_MAC, connectable=True),
+            bluetooth.BluetoothScanningMode.ACTIVE,
+        )
+
+        # Subscribe immediately
+        await self._async_poll_treadmill(None)
+
+        # Heartbeat to catch connections that died silently
+        self._cancel_callback = async_track_time_interval(
+            self.hass,
+            self._async_poll_treadmill,
+            WATCHDOG_INTERVAL,
+        )
+
+    @callback
+    def _on_advertisement(self, service_info, change):
+        """Reconnect when the treadmill advertises while we are not subscribed."""
+        if self._notifying or self._lock.locked() or monotonic() < self._retry_after:
+            return
+        self.hass.async_create_task(self._async_poll_treadmill(None))
+
+    def _connect_failed(self):
+        """Hold off advert-triggered reconnects, backing off while failures repeat."""
+        self._retry_after = monotonic() + self._retry_interval
+        _LOGGER.debug("Treadmill unreachable, next attempt in %d s", self._retry_interval)
+        self._retry_interval = min(
+            self._retry_interval * 2, IDLE_POLL_INTERVAL.total_seconds()
+        )
+
+    async def _async_ensure_connected(self) -> bool:
+        """Connect to the treadmill unless the current connection is still up."""
+        if self._client is not None and self._client.is_connected:
+            return True
+
+        # Get BLE device from Home Assistant's bluetooth
+        # This will use whatever backend is available (local BT or ESP proxy)
+        ble_device = bluetooth.async_ble_device_from_address(
+            self.hass, TREADMILL_MAC, connectable=True
+        )
+
+        if not ble_device:
+            _LOGGER.debug("Treadmill not found via bluetooth discovery")
+            return False
+
+        _LOGGER.debug("Connecting to treadmill via HA bluetooth...")
+
+        # Connect using Bleak (HA will route through proxy if needed)
+        client = BleakClient(
+            ble_device, disconnected_callback=self._on_disconnect, timeout=15.0
+        )
+        await client.connect()
+        self._client = client
+        # Resolve the UUID once per connection instead of on every GATT call
+        self._char = client.services.get_characteristic(CHAR_NOTIFY_1_UUID)
+        if self._char is None:
+            _LOGGER.warning("Treadmill characteristic %s not found", CHAR_NOTIFY_1_UUID)
+            await self._async_disconnect()
+            return False
+        _LOGGER.debug("Connected to treadmill")
+        return True
+
+    @callback
+    def _on_disconnect(self, client: BleakClient):
+        """Forget the connection once the treadmill drops it."""
+        if client is self._client:
+            _LOGGER.debug("Treadmill disconnected")
+            self._client = None
+            self._char = None
+            self._notifying = False
+            self._update_sensor_availability(False)
+
+    @callback
+    def _on_notify(self, char, data: bytearray):
+        """Handle a notification pushed by the treadmill."""
+        self._last_seen = monotonic()
+        self._parse_and_update(data)
+
+    async def _async_disconnect(self):
+        """Close the connection to the treadmill, if any."""
+        client, self._client = self._client, None
+        self._char = None
+        self._notifying = False
+        if client is None:
+            return
+        try:
+            await client.disconnect()
+        except Exception as e:
+            _LOGGER.debug("Error disconnecting treadmill: %s", e)
+
+    async def _async_poll_treadmill(self, now):
+        """Ensure the treadmill notification subscription is up through HA bluetooth.
+
+        While subscribed the treadmill pushes its data, so this only touches
+        the BLE link to reconnect or after WATCHDOG_INTERVAL of silence.
+        """
+        if self._lock.locked():
+            return
+
+        async with self._lock:
+            if (
+                self._notifying
+                and monotonic() - self._last_seen < WATCHDOG_INTERVAL.total_seconds()
+            ):
+                return
+            await self._async_subscribe()
+
+    async def _async_subscribe(self):
+        """Connect, subscribe to notifications and read the current state."""
+        try:
+            if not await self._async_ensure_connected():
+                self._update_sensor_availability(False)
+                self._connect_failed()
+                return
+
+            if not self._notifying:
+                await self._client.start_notify(self._char, self._on_notify)
+                self._notifying = True
+                _LOGGER.info("Subscribed to treadmill notifications")
+
+            # Read characteristic to get the current state and prove the link is alive
+            data = await self._client.read_gatt_char(self._char)
+            _LOGGER.debug("Read %d bytes from treadmill", len(data))
+
+            # Parse and update
+            self._last_seen = monotonic()
+            self._parse_and_update(data)
+            self._update_sensor_availability(True)
+            self._retry_after = 0.0
+            self._retry_interval = POLL_INTERVAL.total_seconds()
+
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Timeout connecting to treadmill")
+            await self._async_disconnect()
+            self._update_sensor_availability(False)
+            self._connect_failed()
+        except Exception as e:
+            _LOGGER.error("Error polling treadmill: %s", e, exc_info=True)
+            await self._async_disconnect()
+            self._update_sensor_availability(False)
+            self._connect_failed()
+
+    async def async_stop(self):
+        """Stop notifications and disconnect."""
+        await super().async_stop()
+        if self._adv_unsub:
+            self._adv_unsub()
+            self._adv_unsub = None
+        if self._notifying and self._client is not None:
+            try:
+                await self._client.stop_notify(self._char)
+            except Exception as e:
+                _LOGGER.debug("Error stopping notifications: %s", e)
+        await self._async_disconnect()
+        _LOGGER.info("Stopped BLE notifications")
+
+
+# Transport used for each configured connection mode
+COORDINATORS = {
+    MODE_PROXY: TreadmillESPProxyCoordinator,
+    MODE_BLUETOOTH: TreadmillBLECoordinator,
+}
 
 
 class NordicTrackSensor(SensorEntity):
     """Representation of a NordicTrack Treadmill sensor."""
 
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        sensor_type: str,
-        name: str,
-        icon: str,
-        unit: str | None,
-    ):
+    # Entity itself is not slotted, so only our own field can be
+    __slots__ = ("sensor_type",)
+
+    def __init__(self, hass: HomeAssistant, sensor_type: str):
         """Initialize the sensor."""
         self.hass = hass
         self.sensor_type = sensor_type
-        self._attr_name = f"NordicTrack {name}"
-        self._attr_unique_id = f"nordictrack_treadmill_{sensor_type}"
-        self._attr_icon = icon
-        self._attr_native_unit_of_measurement = unit
+        (
+            self._attr_name,
+            self._attr_unique_id,
+            self._attr_icon,
+            self._attr_native_unit_of_measurement,
+        ) = SENSOR_SPECS[sensor_type]
         self._attr_state_class = (
             SensorStateClass.MEASUREMENT
             if sensor_type != SENSOR_STATUS
             else None
         )
         self._attr_native_value = None
-
-        # Set device info
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "nordictrack_t5")},
-            "name": "NordicTrack T5 Treadmill",
-            "manufacturer": "NordicTrack",
-            "model": "T5",
-        }
+        self._attr_device_info = DEVICE_INFO
 
     @callback
-    def update_value(self, value):
-        """Update the sensor value."""
+    def update_value(self, value, write: bool = True):
+        """Update the sensor value, writing state unless told not to."""
+        if value == self._attr_native_value:
+            return
         self._attr_native_value = value
-        self.async_write_ha_state()
+        if write:
+            self.async_write_ha_state()
 
     @callback
     def set_available(self, available: bool):
         """Set sensor availability."""
+        if available == self.available:
+            return
         self._attr_available = available
         self.async_write_ha_state()
 
@@ -5,15 +5,19 @@ Run this on a machine with Bluetooth to verify connectivity
 """
 
 import asyncio
+import logging
 from bleak import BleakClient, BleakScanner
 
-# Treadmill configuration
-TREADMILL_MAC = "DC:E3:FA:CF:00:91"
-TREADMILL_NAME = "I_TL"
+from treadmill_test import (
+    CHAR_NOTIFY_1,
+    CHAR_READ_1,
+    TREADMILL_MAC,
+    TREADMILL_NAME,
+    parse_telemetry,
+)
 
-# BLE Characteristics
-CHAR_NOTIFY_1 = "00001535-1412-efde-1523-785feabcd123"  # Main data (73 bytes)
-CHAR_READ_1 = "00001534-1412-efde-1523-785feabcd123"    # Backup data
+logging.basicConfig(level=logging.INFO)
+_LOGGER = logging.getLogger(__name__)
 
 
 async def test_connection():
@@ -26,21 +30,25 @@ async def test_connection():
     print(f"Target Name: {TREADMILL_NAME}")
     print()
 
-    # Step 1: Scan for treadmill
-    print("[1/3] Scanning for treadmill (10 seconds)...")
-    device = await BleakScanner.find_device_by_address(TREADMILL_MAC, timeout=10.0)
-
-    if not device:
-        print(f"❌ Treadmill not found at {TREADMILL_MAC}")
-        print("\nTrying scan by name...")
-        device = await BleakScanner.find_device_by_name(TREADMILL_NAME, timeout=10.0)
-
-        if not device:
-            print(f"❌ Treadmill '{TREADMILL_NAME}' not found")
+    # Step 1: Scan for treadmill, matching MAC or name in a single scan
+    print("[1/3] Scanning for treadmill (up to 10 seconds)...")
+    found = asyncio.get_running_loop().create_future()
+
+    def on_detection(d, adv):
+        if found.done():
+            return
+        if d.address.upper() == TREADMILL_MAC or (d.name or adv.local_name) == TREADMILL_NAME:
+            found.set_result(d)
+
+    async with BleakScanner(detection_callback=on_detection) as scanner:
+        try:
+            async with asyncio.timeout(10.0):
+                device = await found
+        except TimeoutError:
+            print(f"❌ Treadmill not found at {TREADMILL_MAC} or as '{TREADMILL_NAME}'")
             print("\nDiscovered devices:")
-            devices = await BleakScanner.discover(timeout=5.0)
-            for d in devices:
-                print(f"  - {d.name or 'Unknown'} ({d.address})")
+            for d, adv in scanner.discovered_devices_and_advertisement_data.values():
+                print(f"  - {d.name or adv.local_name or 'Unknown'} ({d.address})")
             return False
 
     print(f"✅ Found treadmill: {device.name} at {device.address}")
@@ -60,8 +68,16 @@ async def test_connection():
             # Step 3: Read characteristics
             print("[3/3] Reading BLE characteristics...")
 
-            try:
-                data = await client.read_gatt_char(CHAR_NOTIFY_1)
+            # Issue both reads before waiting, so the round trips overlap
+            data, backup = await asyncio.gather(
+                client.read_gatt_char(CHAR_NOTIFY_1),
+                client.read_gatt_char(CHAR_READ_1),
+                return_exceptions=True,
+            )
+
+            if isinstance(data, Exception):
+                print(f"⚠️  Error reading CHAR_NOTIFY_1: {data}")
+            else:
                 print(f"✅ Read CHAR_NOTIFY_1: {len(data)} bytes")
                 print(f"   Hex: {data.hex()}")
                 print(f"   Raw: {list(data)}")
@@ -69,31 +85,19 @@ async def test_connection():
 
                 # Parse data
                 if len(data) >= 10:
-                    msg_type = data[0]
-                    msg_subtype = data[1]
-                    print(f"   Message Type: 0x{msg_type:02x} {msg_subtype:02x}")
-
-                    if msg_type == 0x00 and msg_subtype == 0x12:
-                        # Speed (bytes 4-5)
-                        speed_raw = (data[5] << 8) | data[4]
-                        speed = speed_raw / 10.0
-                        print(f"   Speed: {speed:.1f} mph")
+                    print(f"   Message Type: 0x{data[0]:02x} {data[1]:02x}")
 
-                        # Incline (bytes 6-7)
-                        if len(data) >= 8:
-                            incline_raw = (data[7] << 8) | data[6]
-                            incline = incline_raw / 10.0
-                            print(f"   Incline: {incline:.1f}%")
-
-            except Exception as e:
-                print(f"⚠️  Error reading CHAR_NOTIFY_1: {e}")
+                    telemetry = parse_telemetry(data)
+                    if telemetry:
+                        speed, incline = telemetry
+                        print(f"   Speed: {speed:.1f} mph")
+                        print(f"   Incline: {incline:.1f}%")
 
-            try:
-                data = await client.read_gatt_char(CHAR_READ_1)
-                print(f"\n✅ Read CHAR_READ_1: {len(data)} bytes")
-                print(f"   Hex: {data.hex()}")
-            except Exception as e:
-                print(f"\n⚠️  Error reading CHAR_READ_1: {e}")
+            if isinstance(backup, Exception):
+                print(f"\n⚠️  Error reading CHAR_READ_1: {backup}")
+            else:
+                print(f"\n✅ Read CHAR_READ_1: {len(backup)} bytes")
+                print(f"   Hex: {backup.hex()}")
 
             print()
             print("="*70)
@@ -102,9 +106,7 @@ async def test_connection():
             return True
 
     except Exception as e:
-        print(f"❌ Connection error: {e}")
-        import traceback
-        traceback.print_exc()
+        _LOGGER.exception("❌ Connection error: %s", e)
         return False
 
 
@@ -116,7 +118,5 @@ if __name__ == "__main__":
         print("\n\n⚠️  Test interrupted")
         exit(1)
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        _LOGGER.exception("❌ Unexpected error: %s", e)
         exit(1)
@@ -6,144 +6,185 @@ This demonstrates the full workflow for the integration
 
 import asyncio
 import logging
-from aioesphomeapi import APIClient
+from aioesphomeapi.core import BluetoothGATTAPIError
 
-# Configuration
-PROXY_HOST = "192.168.2.9"
-PROXY_PORT = 6053
-PROXY_PASSWORD = ""
-PROXY_ENCRYPTION_KEY = "EX1k2GYkbgzMjskMOTy9I4DG7c+lM3bAWs5T2guUvvQ="
+from treadmill_test import (
+    CHAR_NOTIFY_1,
+    TREADMILL_NAME,
+    discover_treadmill,
+    load_handle_cache,
+    parse_telemetry,
+    proxy_client,
+    save_handle_cache,
+)
 
-TREADMILL_NAME = "I_TL"
-CHAR_NOTIFY_1_UUID = "00001535-1412-efde-1523-785feabcd123"
+_NOTIFY_UUID_LOWER = CHAR_NOTIFY_1.lower()
+GATT_INVALID_HANDLE = 0x01
 
 logging.basicConfig(level=logging.INFO)
 _LOGGER = logging.getLogger(__name__)
 
 
-async def main():
-    """Main test flow."""
+async def main(client=None):
+    """Main test flow, on the given proxy session or a new one."""
 
     print("="*70)
     print("COMPLETE TREADMILL DATA READ VIA ESP PROXY")
     print("="*70)
 
-    client = APIClient(PROXY_HOST, PROXY_PORT, PROXY_PASSWORD, noise_psk=PROXY_ENCRYPTION_KEY)
-
     try:
         # Step 1: Connect to proxy
         print(f"\n[1/6] Connecting to ESP proxy...")
-        await client.connect(login=True)
-        device_info = await client.device_info()
-        print(f"✅ {device_info.name} (ESPHome {device_info.esphome_version})")
-
-        # Step 2: Find treadmill
-        print(f"\n[2/6] Scanning for treadmill '{TREADMILL_NAME}'...")
-        treadmill_address = None
-
-        def on_adv(data):
-            nonlocal treadmill_address
-            if data.name == TREADMILL_NAME and not treadmill_address:
-                treadmill_address = data.address
-                print(f"✅ Found at address: {treadmill_address}")
-
-        await client.subscribe_bluetooth_le_advertisements(on_adv)
-        await asyncio.sleep(10)
-
-        if not treadmill_address:
-            print("❌ Treadmill not found")
-            return False
-
-        # Step 3: Connect to treadmill
-        print(f"\n[3/6] Connecting to treadmill...")
-        connected = asyncio.Event()
-
-        def on_connection_state(is_connected, mtu, error):
-            print(f"   Connection state: connected={is_connected}, mtu={mtu}, error={error}")
-            if is_connected:
-                connected.set()
-
-        disconnect_callback = await client.bluetooth_device_connect(
-            treadmill_address,
-            on_connection_state,
-            timeout=30.0
-        )
-
-        # Wait for connection
-        try:
-            await asyncio.wait_for(connected.wait(), timeout=15.0)
-            print("✅ Connected")
-        except asyncio.TimeoutError:
-            print("❌ Connection timeout")
-            return False
-
-        # Step 4: Get GATT services
-        print(f"\n[4/6] Discovering GATT services...")
-        services = await client.bluetooth_gatt_get_services(treadmill_address)
-
-        print(f"✅ Found {len(services.services)} services:")
-        char_handle = None
-
-        for service in services.services:
-            print(f"   Service: {service.uuid}")
-            for char in service.characteristics:
-                print(f"      Characteristic: {char.uuid} (handle: {char.handle})")
-                if char.uuid.lower() == CHAR_NOTIFY_1_UUID.lower():
-                    char_handle = char.handle
-                    print(f"         ⭐ This is our target characteristic!")
-
-        if not char_handle:
-            print(f"❌ Target characteristic {CHAR_NOTIFY_1_UUID} not found")
-            return False
-
-        # Step 5: Read characteristic
-        print(f"\n[5/6] Reading characteristic (handle {char_handle})...")
-        data = await client.bluetooth_gatt_read(treadmill_address, char_handle, timeout=10.0)
-
-        print(f"✅ Read {len(data)} bytes")
-        print(f"   Hex: {data.hex()}")
-        print(f"   Raw: {list(data)}")
-
-        # Step 6: Parse data
-        print(f"\n[6/6] Parsing treadmill data...")
-        if len(data) >= 2:
-            msg_type = data[0]
-            msg_subtype = data[1]
-            print(f"   Message type: 0x{msg_type:02x} {msg_subtype:02x}")
-
-            if msg_type == 0x00 and msg_subtype == 0x12 and len(data) >= 10:
-                speed_raw = (data[5] << 8) | data[4]
-                speed = speed_raw / 10.0
-                print(f"   ✅ Speed: {speed:.1f} mph")
-
-                if len(data) >= 8:
-                    incline_raw = (data[7] << 8) | data[6]
-                    incline = incline_raw / 10.0
+        async with proxy_client(client) as client:
+            device_info = await client.device_info()
+            print(f"✅ {device_info.name} (ESPHome {device_info.esphome_version})")
+
+            # Step 2: Find treadmill
+            print(f"\n[2/6] Scanning for treadmill '{TREADMILL_NAME}'...")
+            adv = await discover_treadmill(client)
+            if not adv:
+                print("❌ Treadmill not found")
+                return False
+
+            treadmill_address = adv.address
+            treadmill_address_type = adv.address_type
+            print(f"✅ Found at address: {treadmill_address}")
+
+            # Step 3: Connect to treadmill
+            print(f"\n[3/6] Connecting to treadmill...")
+            feature_flags = device_info.bluetooth_proxy_feature_flags_compat(client.api_version)
+
+            async def connect_treadmill(has_cache):
+                """Connect to the treadmill, returning its disconnect callback or None."""
+                connected = asyncio.get_running_loop().create_future()
+
+                def on_connection_state(is_connected, mtu, error):
+                    print(f"   Connection state: connected={is_connected}, mtu={mtu}, error={error}")
+                    if connected.done():
+                        return
+                    if is_connected:
+                        connected.set_result(mtu)
+                    else:
+                        connected.set_exception(ConnectionError(f"Connection failed (error {error})"))
+
+                # With cached handles the proxy can skip MTU exchange and service
+                # discovery on the treadmill (connect v3 with cache)
+                disconnect_callback = await client.bluetooth_device_connect(
+                    treadmill_address,
+                    on_connection_state,
+                    timeout=30.0,
+                    feature_flags=feature_flags,
+                    has_cache=has_cache,
+                    address_type=treadmill_address_type
+                )
+
+                # Wait for connection
+                try:
+                    async with asyncio.timeout(15.0):
+                        await connected
+                    print("✅ Connected")
+                except TimeoutError:
+                    print("❌ Connection timeout")
+                    disconnect_callback()
+                    return None
+                except ConnectionError as e:
+                    print(f"❌ {e}")
+                    disconnect_callback()
+                    return None
+                return disconnect_callback
+
+            async def discover_handle():
+                """Walk the GATT services, cache every handle and return ours."""
+                print(f"\n[4/6] Discovering GATT services...")
+                services = await client.bluetooth_gatt_get_services(treadmill_address)
+
+                print(f"✅ Found {len(services.services)} services:")
+                handles = {}
+
+                for service in services.services:
+                    print(f"   Service: {service.uuid}")
+                    for char in service.characteristics:
+                        print(f"      Characteristic: {char.uuid} (handle: {char.handle})")
+                        handles[char.uuid.lower()] = char.handle
+
+                # One walk builds the whole map, later lookups are by key
+                char_handle = handles.get(_NOTIFY_UUID_LOWER)
+                if char_handle:
+                    print(f"   ⭐ Target characteristic has handle {char_handle}")
+
+                save_handle_cache(treadmill_address, handles)
+                return char_handle
+
+            char_handle = load_handle_cache(treadmill_address).get(_NOTIFY_UUID_LOWER)
+            from_cache = bool(char_handle)
+            disconnect_callback = await connect_treadmill(has_cache=from_cache)
+            if not disconnect_callback:
+                return False
+
+            # Step 4: Get GATT services
+            if from_cache:
+                print(f"\n[4/6] Using cached handle {char_handle}, skipping service discovery")
+            else:
+                char_handle = await discover_handle()
+
+            if not char_handle:
+                print(f"❌ Target characteristic {CHAR_NOTIFY_1} not found")
+                return False
+
+            # Step 5: Read characteristic
+            print(f"\n[5/6] Reading characteristic (handle {char_handle})...")
+            try:
+                data = await client.bluetooth_gatt_read(treadmill_address, char_handle, timeout=10.0)
+            except BluetoothGATTAPIError as e:
+                if not from_cache or e.error.error != GATT_INVALID_HANDLE:
+                    raise
+                # Stale cache (firmware update?), reconnect so the proxy discovers again
+                print(f"⚠️  Cached handle {char_handle} is invalid, rediscovering...")
+                await client.bluetooth_device_disconnect(treadmill_address)
+                disconnect_callback()
+                disconnect_callback = await connect_treadmill(has_cache=False)
+                if not disconnect_callback:
+                    return False
+                char_handle = await discover_handle()
+                if not char_handle:
+                    print(f"❌ Target characteristic {CHAR_NOTIFY_1} not found")
+                    return False
+                data = await client.bluetooth_gatt_read(treadmill_address, char_handle, timeout=10.0)
+
+            print(f"✅ Read {len(data)} bytes")
+            print(f"   Hex: {data.hex()}")
+            print(f"   Raw: {list(data)}")
+
+            # Step 6: Parse data
+            print(f"\n[6/6] Parsing treadmill data...")
+            if len(data) >= 2:
+                print(f"   Message type: 0x{data[0]:02x} {data[1]:02x}")
+
+                telemetry = parse_telemetry(data)
+                if telemetry:
+                    speed, incline = telemetry
+                    print(f"   ✅ Speed: {speed:.1f} mph")
                     print(f"   ✅ Incline: {incline:.1f}%")
 
-                status = "running" if speed > 0 else "idle"
-                print(f"   ✅ Status: {status}")
-            else:
-                print(f"   ℹ️  Not telemetry data (treadmill may be idle)")
+                    status = "running" if speed > 0 else "idle"
+                    print(f"   ✅ Status: {status}")
+                else:
+                    print(f"   ℹ️  Not telemetry data (treadmill may be idle)")
 
-        # Disconnect
-        print(f"\n[7/6] Disconnecting...")
-        await client.bluetooth_device_disconnect(treadmill_address)
-        disconnect_callback()
-        print("✅ Disconnected")
+            # Disconnect
+            print(f"\n[7/6] Disconnecting...")
+            await client.bluetooth_device_disconnect(treadmill_address)
+            disconnect_callback()
+            print("✅ Disconnected")
 
-        print("\n" + "="*70)
-        print("✅ TEST PASSED - Can read treadmill data via ESP proxy!")
-        print("="*70)
-        return True
+            print("\n" + "="*70)
+            print("✅ TEST PASSED - Can read treadmill data via ESP proxy!")
+            print("="*70)
+            return True
 
     except Exception as e:
-        print(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        _LOGGER.exception("❌ Error: %s", e)
         return False
-    finally:
-        await client.disconnect()
 
 
 if __name__ == "__main__":
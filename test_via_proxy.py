@@ -6,29 +6,24 @@ This script connects through the M5Stack BLE proxy device
 
 import asyncio
 import logging
-from aioesphomeapi import APIClient
 
-# BLE Proxy configuration
-PROXY_HOST = "192.168.2.9"
-PROXY_PORT = 6053
-PROXY_PASSWORD = ""  # ESPHome uses encryption key, not password
-PROXY_ENCRYPTION_KEY = "EX1k2GYkbgzMjskMOTy9I4DG7c+lM3bAWs5T2guUvvQ="
-
-# Treadmill configuration
-TREADMILL_MAC = "DC:E3:FA:CF:00:91"  # Linux format MAC
-TREADMILL_NAME = "I_TL"
-
-# BLE Characteristics
-CHAR_NOTIFY_1 = "00001535-1412-efde-1523-785feabcd123"  # Main data
-CHAR_READ_1 = "00001534-1412-efde-1523-785feabcd123"    # Backup data
+from treadmill_test import (
+    CHAR_NOTIFY_1,
+    PROXY_HOST,
+    PROXY_PORT,
+    TREADMILL_MAC,
+    TREADMILL_NAME,
+    discover_treadmill,
+    proxy_client,
+)
 
 # Enable logging
 logging.basicConfig(level=logging.INFO)
 _LOGGER = logging.getLogger(__name__)
 
 
-async def test_via_proxy():
-    """Test connection through BLE proxy"""
+async def test_via_proxy(client=None):
+    """Test connection through BLE proxy, optionally on an open session"""
 
     print("="*70)
     print("NORDICTRACK TREADMILL - BLE PROXY CONNECTION TEST")
@@ -40,96 +35,95 @@ async def test_via_proxy():
 
     # Step 1: Connect to ESPHome API
     print("[1/4] Connecting to ESPHome BLE Proxy...")
-    client = APIClient(
-        PROXY_HOST,
-        PROXY_PORT,
-        PROXY_PASSWORD,
-        noise_psk=PROXY_ENCRYPTION_KEY
-    )
-
     try:
-        await client.connect(login=True)
-        print(f"✅ Connected to BLE proxy")
-        print()
-
-        # Step 2: Get device info
-        print("[2/4] Getting device info...")
-        device_info = await client.device_info()
-        print(f"✅ Device: {device_info.name}")
-        print(f"   Model: {device_info.model}")
-        print(f"   ESPHome Version: {device_info.esphome_version}")
-        print()
-
-        # Step 3: List Bluetooth devices
-        print("[3/4] Scanning for Bluetooth devices...")
-
-        # Subscribe to BLE advertisements
-        found_treadmill = False
-        treadmill_address = None
-
-        def on_bluetooth_le_advertisement(data):
-            nonlocal found_treadmill, treadmill_address
-            if data.name == TREADMILL_NAME or data.address == TREADMILL_MAC:
-                found_treadmill = True
-                treadmill_address = data.address
-                print(f"✅ Found treadmill: {data.name} at {data.address}")
-                print(f"   RSSI: {data.rssi} dBm")
-
-        await client.subscribe_bluetooth_le_advertisements(on_bluetooth_le_advertisement)
-
-        # Wait for advertisements
-        print("   Listening for advertisements (10 seconds)...")
-        await asyncio.sleep(10)
-
-        if not found_treadmill:
-            print(f"❌ Treadmill not found")
-            return False
-
-        print()
-
-        # Step 4: Connect to treadmill via proxy
-        print("[4/4] Connecting to treadmill via proxy...")
-
-        # Request connection
-        connection_id = await client.bluetooth_device_connect(
-            treadmill_address,
-            timeout=15.0
-        )
-
-        print(f"✅ Connected! Connection ID: {connection_id}")
-        print()
-
-        # Read characteristic
-        print("Reading BLE characteristics...")
-
-        try:
-            # Read characteristic by handle
-            # Note: We may need service discovery first to get the correct handle
-            print(f"   Attempting to read characteristic {CHAR_NOTIFY_1}...")
-            print(f"   (Full BLE GATT operations via ESPHome proxy coming soon)")
+        async with proxy_client(client) as client:
+            print(f"✅ Connected to BLE proxy")
+            print()
+
+            # Step 2: Get device info
+            print("[2/4] Getting device info...")
+            device_info = await client.device_info()
+            print(f"✅ Device: {device_info.name}")
+            print(f"   Model: {device_info.model}")
+            print(f"   ESPHome Version: {device_info.esphome_version}")
             print()
 
-        except Exception as e:
-            print(f"⚠️  Error: {e}")
+            # Step 3: List Bluetooth devices
+            print("[3/4] Scanning for Bluetooth devices...")
 
-        # Disconnect
-        await client.bluetooth_device_disconnect(treadmill_address)
-        print("✅ Disconnected from treadmill")
+            # Wait for advertisements, stopping as soon as the treadmill shows up
+            print("   Listening for advertisements (up to 10 seconds)...")
+            adv = await discover_treadmill(client)
+            if not adv:
+                print(f"❌ Treadmill not found")
+                return False
 
-        print()
-        print("="*70)
-        print("✅ TEST PASSED - BLE Proxy connection working!")
-        print("="*70)
-        return True
+            treadmill_address = adv.address
+            treadmill_address_type = adv.address_type
+            print(f"✅ Found treadmill: {adv.name} at {adv.address}")
+            print(f"   RSSI: {adv.rssi} dBm")
+
+            print()
+
+            # Step 4: Connect to treadmill via proxy
+            print("[4/4] Connecting to treadmill via proxy...")
+
+            connected = asyncio.get_running_loop().create_future()
+
+            def on_connection_state(is_connected, mtu, error):
+                if connected.done():
+                    return
+                if is_connected:
+                    connected.set_result(mtu)
+                else:
+                    connected.set_exception(ConnectionError(f"Connection failed (error {error})"))
+
+            # Nothing is read here, so tell the proxy it may skip MTU exchange
+            # and service discovery (connect v3 with cache)
+            disconnect_callback = await client.bluetooth_device_connect(
+                treadmill_address,
+                on_connection_state,
+                timeout=15.0,
+                feature_flags=device_info.bluetooth_proxy_feature_flags_compat(client.api_version),
+                has_cache=True,
+                address_type=treadmill_address_type
+            )
+            try:
+                async with asyncio.timeout(15.0):
+                    await connected
+
+                print(f"✅ Connected!")
+                print()
+
+                # Read characteristic
+                print("Reading BLE characteristics...")
+
+                try:
+                    # Read characteristic by handle
+                    # Note: We may need service discovery first to get the correct handle
+                    print(f"   Attempting to read characteristic {CHAR_NOTIFY_1}...")
+                    print(f"   (Full BLE GATT operations via ESPHome proxy coming soon)")
+                    print()
+
+                except Exception as e:
+                    print(f"⚠️  Error: {e}")
+
+            finally:
+                # Disconnect before an error is reported, not after
+                await client.bluetooth_device_disconnect(treadmill_address)
+                disconnect_callback()
+                print("✅ Disconnected from treadmill")
+
+            print()
+            print("="*70)
+            print("✅ TEST PASSED - BLE Proxy connection working!")
+            print("="*70)
+            return True
 
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        _LOGGER.exception("❌ Error: %s", e)
         return False
 
-    finally:
-        await client.disconnect()
 
 
 if __name__ == "__main__":
@@ -140,7 +134,5 @@ if __name__ == "__main__":
         print("\n\n⚠️  Test interrupted")
         exit(1)
     except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        _LOGGER.exception("❌ Unexpected error: %s", e)
         exit(1)
@@ -0,0 +1,114 @@
+"""
+Configuration and helpers shared by the treadmill test scripts
+Run every proxy test on one session with: python -m treadmill_test.run_all
+(from the integration directory, or with it on PYTHONPATH)
+"""
+
+import asyncio
+import json
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+# The integration directory holds the decoder and the test scripts; put it on
+# the path so they import whatever the working directory is
+INTEGRATION_DIR = str(Path(__file__).resolve().parent.parent)
+if INTEGRATION_DIR not in sys.path:
+    sys.path.insert(0, INTEGRATION_DIR)
+
+from codec import is_telemetry, unpack_telemetry  # noqa: E402
+
+# ESP Proxy config
+PROXY_HOST = "192.168.2.9"
+PROXY_PORT = 6053
+PROXY_PASSWORD = ""  # ESPHome uses encryption key, not password
+PROXY_ENCRYPTION_KEY = "EX1k2GYkbgzMjskMOTy9I4DG7c+lM3bAWs5T2guUvvQ="
+
+# Treadmill config
+TREADMILL_MAC = "DC:E3:FA:CF:00:91"  # Linux format MAC
+TREADMILL_NAME = "I_TL"
+TREADMILL_ADDRESS = int(TREADMILL_MAC.replace(":", ""), 16)  # As reported by the proxy
+
+# BLE Characteristics
+CHAR_NOTIFY_1 = "00001535-1412-efde-1523-785feabcd123"  # Main data (73 bytes)
+CHAR_READ_1 = "00001534-1412-efde-1523-785feabcd123"    # Backup data
+
+# Characteristic handles from earlier runs, keyed by treadmill address
+HANDLE_CACHE = Path.home() / ".cache" / "nordictrack_treadmill" / "handles.json"
+
+
+@asynccontextmanager
+async def proxy_client(client=None):
+    """Yield a logged-in APIClient, reusing the given one if any.
+
+    Only a session opened here is closed on exit.
+    """
+    if client is not None:
+        yield client
+        return
+
+    # Imported here so the Bleak-only direct test does not load aioesphomeapi
+    from aioesphomeapi import APIClient
+
+    client = APIClient(
+        PROXY_HOST,
+        PROXY_PORT,
+        PROXY_PASSWORD,
+        noise_psk=PROXY_ENCRYPTION_KEY
+    )
+    await client.connect(login=True)
+    try:
+        yield client
+    finally:
+        await client.disconnect()
+
+
+async def discover_treadmill(client, timeout=10.0):
+    """Return the first treadmill advertisement the proxy hears, or None."""
+    found = asyncio.get_running_loop().create_future()
+
+    def on_advertisement(data):
+        if found.done():
+            return
+        if data.name == TREADMILL_NAME or data.address == TREADMILL_ADDRESS:
+            found.set_result(data)
+
+    # Returns the unsubscribe callable, don't await it
+    unsub_adv = client.subscribe_bluetooth_le_advertisements(on_advertisement)
+    try:
+        async with asyncio.timeout(timeout):
+            return await found
+    except TimeoutError:
+        return None
+    finally:
+        # Stop the proxy streaming every advertisement it hears
+        unsub_adv()
+
+
+def parse_telemetry(data):
+    """Return (speed mph, incline %) of a telemetry frame, None for other frames."""
+    if not is_telemetry(data):
+        return None
+    _, _, speed_raw, incline_raw = unpack_telemetry(data)
+    return speed_raw / 10.0, incline_raw / 10.0
+
+
+def _read_handle_cache():
+    """Return the whole handle cache file, or an empty one."""
+    try:
+        return json.loads(HANDLE_CACHE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def load_handle_cache(address):
+    """Return the cached {characteristic UUID: handle} map of a treadmill."""
+    return _read_handle_cache().get(str(address), {})
+
+
+def save_handle_cache(address, handles):
+    """Store the {characteristic UUID: handle} map of a treadmill."""
+    cache = _read_handle_cache()
+    cache[str(address)] = handles
+    HANDLE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    HANDLE_CACHE.write_text(json.dumps(cache, indent=2))
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Run every ESP proxy test on a single proxy session
+Usage, from the integration directory (or with it on PYTHONPATH):
+    python -m treadmill_test.run_all
+"""
+
+import asyncio
+
+# Puts the integration directory on sys.path for the test scripts below
+from treadmill_test import proxy_client
+
+import test_esp_complete  # noqa: E402
+import test_esp_gatt_read  # noqa: E402
+import test_via_proxy  # noqa: E402
+
+TESTS = (
+    ("test_via_proxy", test_via_proxy.test_via_proxy),
+    ("test_esp_gatt_read", test_esp_gatt_read.test_gatt_read),
+    ("test_esp_complete", test_esp_complete.main),
+)
+
+
+async def run_all():
+    """Run the proxy tests back to back, returning whether all passed."""
+    results = {}
+    async with proxy_client() as client:
+        for name, test in TESTS:
+            results[name] = await test(client)
+
+    print("\n" + "="*70)
+    for name, passed in results.items():
+        print(f"{'✅' if passed else '❌'} {name}")
+    print("="*70)
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    result = asyncio.run(run_all())
+    exit(0 if result else 1)